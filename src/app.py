@@ -1,91 +1,167 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import polars as pl
+import pyarrow.dataset as ds
 import streamlit as st
 
 DATA_PATH = Path(__file__).parent.parent / "output" / "companies.parquet"
 PODCAST_DIR = Path(__file__).parent.parent / "output" / "podcast"
+PAGE_SIZE = 200
 
 st.set_page_config(page_title="Blossom Investment Signals", layout="wide")
 
 
-@st.cache_data
 def load_data():
     if not DATA_PATH.exists():
         return None
-    return pl.read_parquet(DATA_PATH)
+    return pl.scan_parquet(DATA_PATH)
+
+
+@st.cache_data
+def get_filter_options(mtime: float) -> dict[str, list]:
+    # The pipeline precomputes the distinct lists alongside the parquet
+    options_path = DATA_PATH.parent / "filter_options.json"
+    if options_path.exists():
+        return json.loads(options_path.read_text())
+
+    # Arrow-level projection: read only the three option columns' pages
+    dataset = ds.dataset(DATA_PATH)
+    names = frozenset(dataset.schema.names)
+    tbl = dataset.to_table(columns=[c for c in ("nace_category", "verdict", "stage") if c in names])
+    opts = {"categories": sorted(c for c in set(tbl["nace_category"].drop_null().to_pylist()) if c)}
+    for key, col in [("verdicts", "verdict"), ("stages", "stage")]:
+        if col in names:
+            opts[key] = sorted(v for v in set(tbl[col].drop_null().to_pylist()) if v and v != "Unknown")
+    return opts
+
+
+def apply_filters(lf, cats: tuple, tech_only: bool, research_only: bool, verdicts: tuple, stages: tuple, search: str):
+    # Cheap selective predicates first; the substring search goes last so it
+    # only scans surviving rows. All predicates go into one filter call so a
+    # single AND-combined mask is evaluated in one pass.
+    preds = []
+    if tech_only:
+        preds.append(pl.col("is_tech"))
+    if cats:
+        preds.append(pl.col("nace_category").is_in(list(cats)))
+    if research_only:
+        preds.append(pl.col("research_report").is_not_null())
+    if verdicts:
+        preds.append(pl.col("verdict").is_in(list(verdicts)))
+    if stages:
+        preds.append(pl.col("stage").is_in(list(stages)))
+    if search:
+        preds.append(pl.col("company_name_lc").str.contains(search, literal=True))
+    if preds:
+        lf = lf.filter(pl.all_horizontal(preds))
+    return lf
 
 
 @st.cache_data
+def chart_data(mtime: float, *filter_key):
+    lf = apply_filters(load_data(), *filter_key)
+    return pl.collect_all([
+        lf.group_by("nace_category").len().sort("len", descending=True).head(10),
+        lf.group_by("year").len().sort("year"),
+    ])
+
+
+@st.cache_resource
 def load_podcast_data():
     if not PODCAST_DIR.exists():
         return None, None, None
-    analysis = pl.read_parquet(PODCAST_DIR / "guest_analysis.parquet") if (PODCAST_DIR / "guest_analysis.parquet").exists() else None
-    episodes = pl.read_parquet(PODCAST_DIR / "all_episodes.parquet") if (PODCAST_DIR / "all_episodes.parquet").exists() else None
-    researched = pl.read_parquet(PODCAST_DIR / "researched.parquet") if (PODCAST_DIR / "researched.parquet").exists() else None
-    return analysis, episodes, researched
+    # Polars releases the GIL during parquet decode, so the three reads
+    # overlap on separate cores
+    paths = [PODCAST_DIR / f"{name}.parquet" for name in ("guest_analysis", "all_episodes", "researched")]
+    with ThreadPoolExecutor(3) as ex:
+        futs = [ex.submit(pl.read_parquet, p) if p.exists() else None for p in paths]
+        return tuple(f.result() if f else None for f in futs)
 
 
 def cro_tab():
-    df = load_data()
-    if df is None:
+    lf = load_data()
+    if lf is None:
         st.error("No data found. Run `uv run python -m src.main` first.")
         return
 
+    schema = frozenset(lf.collect_schema().names())
+    has_verdict = "verdict" in schema
+    has_stage = "stage" in schema
+    has_research_col = "research_report" in schema
+    opts = get_filter_options(DATA_PATH.stat().st_mtime)
+
     # Filters in expander
     with st.expander("🔍 Filters", expanded=True):
         col1, col2, col3 = st.columns(3)
         with col1:
-            categories = sorted([c for c in df["nace_category"].unique().to_list() if c])
-            selected_cats = st.multiselect("Industry Category", categories, default=[], key="cro_cats")
+            selected_cats = st.multiselect("Industry Category", opts["categories"], default=[], key="cro_cats")
             tech_only = st.checkbox("Tech companies only", key="cro_tech")
         with col2:
             has_research = st.checkbox("Has research data", value=True, key="cro_research")
             selected_verdicts = []
-            if "verdict" in df.columns:
-                verdicts = sorted([v for v in df["verdict"].unique().to_list() if v and v != "Unknown"])
-                selected_verdicts = st.multiselect("Investment Verdict", verdicts, default=[], key="cro_verdicts")
+            if has_verdict:
+                selected_verdicts = st.multiselect("Investment Verdict", opts["verdicts"], default=[], key="cro_verdicts")
         with col3:
             selected_stages = []
-            if "stage" in df.columns:
-                stages = sorted([s for s in df["stage"].unique().to_list() if s and s != "Unknown"])
-                selected_stages = st.multiselect("Company Stage", stages, default=[], key="cro_stages")
+            if has_stage:
+                selected_stages = st.multiselect("Company Stage", opts["stages"], default=[], key="cro_stages")
             search = st.text_input("Search company name", key="cro_search")
 
-    # Apply filters
-    filtered = df
-    if selected_cats:
-        filtered = filtered.filter(pl.col("nace_category").is_in(selected_cats))
-    if tech_only:
-        filtered = filtered.filter(pl.col("is_tech") == True)
-    if has_research and "research_report" in df.columns:
-        filtered = filtered.filter(pl.col("research_report").is_not_null())
-    if "verdict" in df.columns and selected_verdicts:
-        filtered = filtered.filter(pl.col("verdict").is_in(selected_verdicts))
-    if "stage" in df.columns and selected_stages:
-        filtered = filtered.filter(pl.col("stage").is_in(selected_stages))
-    if search:
-        filtered = filtered.filter(pl.col("company_name").str.to_lowercase().str.contains(search.lower()))
+    # Apply filters lazily; predicates are pushed into the parquet scan
+    filter_key = (
+        tuple(sorted(selected_cats)),
+        tech_only,
+        has_research and has_research_col,
+        tuple(sorted(selected_verdicts)),
+        tuple(sorted(selected_stages)),
+        search.lower(),
+    )
+    filtered = apply_filters(lf, *filter_key)
+
+    # One-row probe: if the filters match nothing, skip KPIs/charts/table
+    if filtered.head(1).collect().is_empty():
+        st.info("No companies match the current filters.")
+        return
+
+    # Recompute the heavy views only when the filter state actually changed;
+    # unrelated widget interactions (row clicks, page flips) reuse them
+    if st.session_state.get("cro_filter_key") != filter_key:
+        kpi_exprs = [pl.len(), pl.col("is_tech").sum(), pl.col("has_eu_grant").sum()]
+        if has_research_col:
+            kpi_exprs.append(pl.col("research_report").is_not_null().sum())
+        display_cols = ["company_name", "verdict", "website", "industry", "stage"]
+        # One collect_all so Polars shares the filtered scan across views;
+        # chart aggregations are memoized per filter state
+        kpi_df, display_df = pl.collect_all([
+            filtered.select(kpi_exprs),
+            filtered.select([c for c in display_cols if c in schema]),
+        ])
+        cat_counts, yearly = chart_data(DATA_PATH.stat().st_mtime, *filter_key)
+        st.session_state["cro_filter_key"] = filter_key
+        st.session_state["cro_views"] = (kpi_df, cat_counts, yearly, display_df)
+    kpi_df, cat_counts, yearly, display_df = st.session_state["cro_views"]
+
+    # KPI cards - one fused scan instead of a count pass per metric
+    kpis = kpi_df.row(0)
+    total, tech_count, grant_count = kpis[:3]
+    research_count = kpis[3] if has_research_col else None
 
-    # KPI cards
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
-        st.metric("Total Companies", f"{filtered.shape[0]:,}")
+        st.metric("Total Companies", f"{total:,}")
     with col2:
-        tech_count = filtered.filter(pl.col("is_tech") == True).shape[0]
         st.metric("Tech Companies", f"{tech_count:,}")
     with col3:
-        if filtered.shape[0] > 0:
-            pct = tech_count / filtered.shape[0] * 100
-            st.metric("% Tech", f"{pct:.1f}%")
+        if total > 0:
+            st.metric("% Tech", f"{tech_count / total * 100:.1f}%")
         else:
             st.metric("% Tech", "0%")
     with col4:
-        grant_count = filtered.filter(pl.col("has_eu_grant") == True).shape[0]
         st.metric("With EU Grants", f"{grant_count:,}")
     with col5:
-        if "research_report" in filtered.columns:
-            research_count = filtered.filter(pl.col("research_report").is_not_null()).shape[0]
+        if research_count is not None:
             st.metric("With Research", f"{research_count:,}")
         else:
             st.metric("With Research", "N/A")
@@ -97,24 +173,10 @@ def cro_tab():
 
     with col1:
         st.subheader("By Industry Category")
-        cat_counts = (
-            filtered.group_by("nace_category")
-            .len()
-            .sort("len", descending=True)
-            .head(10)
-            .to_pandas()
-        )
         st.bar_chart(cat_counts, x="nace_category", y="len")
 
     with col2:
         st.subheader("Registrations by Year")
-        yearly = (
-            filtered.with_columns(pl.col("company_reg_date").str.slice(0, 4).alias("year"))
-            .group_by("year")
-            .len()
-            .sort("year")
-            .to_pandas()
-        )
         st.bar_chart(yearly, x="year", y="len")
 
     st.divider()
@@ -125,14 +187,13 @@ def cro_tab():
     with left_col:
         st.subheader("Companies")
 
-        display_cols = ["company_name", "verdict", "website", "industry", "stage"]
-        display_df = filtered.select([c for c in display_cols if c in filtered.columns])
-
-        if "verdict" in display_df.columns:
-            display_df = display_df.sort("verdict", nulls_last=True)
+        # Only ship one page of rows to the browser
+        pages = max(1, -(-display_df.height // PAGE_SIZE))
+        page = st.number_input("Page", 1, pages, 1, key="cro_page") if pages > 1 else 1
+        page_df = display_df.slice((page - 1) * PAGE_SIZE, PAGE_SIZE)
 
         selection = st.dataframe(
-            display_df.to_pandas(),
+            page_df,
             use_container_width=True,
             hide_index=True,
             height=600,
@@ -144,8 +205,7 @@ def cro_tab():
     with right_col:
         st.subheader("Company Detail")
 
-        company_names = display_df["company_name"].to_list()
-        if not company_names:
+        if page_df.height == 0:
             return
 
         # Get selected from table click
@@ -153,17 +213,22 @@ def cro_tab():
         if selection and selection.selection and selection.selection.rows:
             selected_idx = selection.selection.rows[0]
 
-        selected = company_names[selected_idx]
+        selected = page_df["company_name"][selected_idx]
         st.caption(f"Selected: **{selected}**")
 
-        detail = filtered.filter(pl.col("company_name") == selected).to_pandas().iloc[0]
+        detail = (
+            pl.scan_parquet(DATA_PATH)
+            .filter(pl.col("company_name") == selected)
+            .collect()
+            .row(0, named=True)
+        )
 
-        verdict = detail.get("verdict") or ""
-        if "Promising" in verdict:
+        verdict_code = detail.get("verdict_code")
+        if verdict_code == 0:
             st.success(f"**Verdict: Promising** - {detail.get('verdict_reason') or ''}")
-        elif "Maybe" in verdict:
+        elif verdict_code == 1:
             st.warning(f"**Verdict: Maybe** - {detail.get('verdict_reason') or ''}")
-        elif "Pass" in verdict:
+        elif verdict_code == 2:
             st.error(f"**Verdict: Pass** - {detail.get('verdict_reason') or ''}")
 
         website = detail.get("website")
@@ -207,12 +272,18 @@ def podcast_tab():
         with col3:
             high_signal_only = st.checkbox("High-signal only (2+ appearances)", value=False, key="pod_high")
 
-    # Apply filters
-    filtered = analysis
-    if high_signal_only:
-        filtered = filtered.filter(pl.col("high_signal") == True)
-    filtered = filtered.filter(pl.col("appearances") >= min_appearances)
-    filtered = filtered.filter(pl.col("signal_score") >= min_score)
+    # Apply filters; reuse the filtered frame across reruns that only
+    # change the row selection
+    pod_key = (high_signal_only, min_appearances, min_score)
+    if st.session_state.get("pod_filter_key") != pod_key:
+        filtered = analysis
+        if high_signal_only:
+            filtered = filtered.filter(pl.col("high_signal"))
+        filtered = filtered.filter(pl.col("appearances") >= min_appearances)
+        filtered = filtered.filter(pl.col("signal_score") >= min_score)
+        st.session_state["pod_filter_key"] = pod_key
+        st.session_state["pod_filtered"] = filtered
+    filtered = st.session_state["pod_filtered"]
 
     # KPIs
     col1, col2, col3, col4 = st.columns(4)
@@ -222,7 +293,7 @@ def podcast_tab():
     with col2:
         st.metric("Unique Guests", f"{analysis.shape[0]:,}")
     with col3:
-        high_count = analysis.filter(pl.col("high_signal") == True).shape[0]
+        high_count = analysis.select(pl.col("high_signal").sum()).item()
         st.metric("High-Signal Founders", f"{high_count:,}")
     with col4:
         researched_count = researched.shape[0] if researched is not None else 0
@@ -248,7 +319,7 @@ def podcast_tab():
         display_df = filtered.sort("signal_score", descending=True).select([c for c in display_cols if c in filtered.columns])
 
         selection = st.dataframe(
-            display_df.to_pandas(),
+            display_df,
             use_container_width=True,
             hide_index=True,
             on_select="rerun",
@@ -259,8 +330,7 @@ def podcast_tab():
     with right_col:
         st.subheader("Founder Detail")
 
-        guest_names = display_df["guest_name"].to_list()
-        if not guest_names:
+        if display_df.height == 0:
             return
 
         # Get selected from table click
@@ -268,8 +338,8 @@ def podcast_tab():
         if selection and selection.selection and selection.selection.rows:
             selected_idx = selection.selection.rows[0]
 
-        selected = guest_names[selected_idx]
-        detail = filtered.filter(pl.col("guest_name") == selected).to_pandas().iloc[0]
+        selected = display_df["guest_name"][selected_idx]
+        detail = filtered.filter(pl.col("guest_name") == selected).row(0, named=True)
         company = detail.get("company_name")
 
         st.markdown(f"### {selected}")
@@ -288,19 +358,22 @@ def podcast_tab():
             st.divider()
             st.markdown("**Podcast Appearances:**")
             guest_eps = episodes.filter(pl.col("guest_name") == selected).sort("pub_date", descending=True)
+            # One markdown delta instead of one websocket message per episode
+            lines = []
             for row in guest_eps.iter_rows(named=True):
-                date_str = row["pub_date"][:10] if row["pub_date"] else ""
+                date_str = row["pub_date"].strftime("%Y-%m-%d") if row["pub_date"] else ""
                 link = row.get("link", "")
                 title = row.get("episode_title", "")[:60]
                 if link:
-                    st.markdown(f"- **{row['podcast']}** ({date_str}): [{title}...]({link})")
+                    lines.append(f"- **{row['podcast']}** ({date_str}): [{title}...]({link})")
                 else:
-                    st.markdown(f"- **{row['podcast']}** ({date_str}): {title}...")
+                    lines.append(f"- **{row['podcast']}** ({date_str}): {title}...")
+            st.markdown("\n".join(lines))
 
         if researched is not None:
             research_row = researched.filter(pl.col("company_name") == company)
-            if research_row.shape[0] > 0:
-                r = research_row.to_pandas().iloc[0]
+            if research_row.height > 0:
+                r = research_row.row(0, named=True)
                 st.divider()
 
                 likelihood = r.get("fundraise_likelihood") or ""
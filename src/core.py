@@ -12,6 +12,8 @@ Tested approaches that all fail:
 Would need captcha-solving service (2Captcha) or manual session cookies.
 """
 
+import asyncio
+
 from bs4 import BeautifulSoup
 
 from src.http import fetch
@@ -48,7 +50,12 @@ async def enrich_with_directors(company_nums: list[int]) -> dict[int, list[str]]
 
     Returns dict mapping company_num -> list of director names.
     """
-    results = {}
-    for num in company_nums:
-        results[num] = await scrape_directors(num)
-    return results
+    # Concurrent fetches; the per-domain limiter in src.http still throttles
+    semaphore = asyncio.Semaphore(32)
+
+    async def limited_scrape(num: int) -> list[str]:
+        async with semaphore:
+            return await scrape_directors(num)
+
+    results = await asyncio.gather(*[limited_scrape(n) for n in company_nums])
+    return dict(zip(company_nums, results))
@@ -20,7 +20,7 @@ async def _download_file(url: str, dest: Path) -> Path:
     return dest
 
 
-async def download_companies() -> pl.DataFrame:
+async def download_companies() -> pl.LazyFrame:
     zip_path = DATA_DIR / "companies.csv.zip"
     csv_path = DATA_DIR / "companies.csv"
 
@@ -30,4 +30,4 @@ async def download_companies() -> pl.DataFrame:
             csv_name = [n for n in zf.namelist() if n.endswith(".csv")][0]
             csv_path.write_bytes(zf.read(csv_name))
 
-    return pl.read_csv(csv_path, infer_schema_length=10000)
+    return pl.scan_csv(csv_path, infer_schema_length=10000)
@@ -2,57 +2,63 @@
 Enrichment functions for company data.
 """
 
-import io
-import json
+import tempfile
+import time
 import zipfile
 from pathlib import Path
 
 import aiohttp
+import ijson
 import polars as pl
 
-from src.http import cache, TTL
+from src.http import TTL
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 CORDIS_URL = "https://cordis.europa.eu/data/cordis-HORIZONprojects-json.zip"
+CORDIS_CACHE = DATA_DIR / "cordis_ie.parquet"
+
+NAME_SUFFIX_RE = r"\s+(LIMITED|LTD|DAC|PLC|DESIGNATED ACTIVITY COMPANY)\.?$"
+
+
+def _norm_name(col: str) -> pl.Expr:
+    # Anchored suffix matches at most once, so a single replace suffices
+    return pl.col(col).str.to_uppercase().str.replace(NAME_SUFFIX_RE, "").str.strip_chars().alias("_name_norm")
 
 
 async def download_cordis() -> pl.DataFrame:
     """Download CORDIS organization data and filter for Irish companies."""
-    cache_key = "cordis:organizations:IE"
-
-    if cache_key in cache:
-        return pl.DataFrame(cache[cache_key])
+    if CORDIS_CACHE.exists() and time.time() - CORDIS_CACHE.stat().st_mtime < TTL:
+        return pl.read_parquet(CORDIS_CACHE)
 
     print("  Downloading CORDIS data...")
-    async with aiohttp.ClientSession() as session:
-        async with session.get(CORDIS_URL) as resp:
-            if resp.status != 200:
-                print(f"  Failed to download CORDIS data: {resp.status}")
-                return pl.DataFrame()
-            data = await resp.read()
-
-    # Extract organization.json from zip
-    with zipfile.ZipFile(io.BytesIO(data)) as zf:
-        with zf.open("organization.json") as f:
-            orgs = json.load(f)
-
-    # Filter for Irish organizations
-    irish_orgs = [o for o in orgs if o.get("country") == "IE"]
+    # Spool the zip to a temp file and stream-parse the org array so neither
+    # the full body nor the full JSON ever sits in memory at once
+    with tempfile.SpooledTemporaryFile(max_size=1 << 26) as tf:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(CORDIS_URL) as resp:
+                if resp.status != 200:
+                    print(f"  Failed to download CORDIS data: {resp.status}")
+                    return pl.DataFrame()
+                async for chunk in resp.content.iter_chunked(1 << 20):
+                    tf.write(chunk)
+
+        tf.seek(0)
+        with zipfile.ZipFile(tf) as zf, zf.open("organization.json") as f:
+            irish_orgs = [o for o in ijson.items(f, "item", use_float=True) if o.get("country") == "IE"]
     print(f"  Found {len(irish_orgs)} Irish organizations in CORDIS")
 
     if not irish_orgs:
         return pl.DataFrame()
 
-    # Convert to DataFrame
+    # Convert to DataFrame and cache as parquet (columnar reload, no pickle)
     df = pl.DataFrame(irish_orgs)
-
-    # Cache the result
-    cache.set(cache_key, df.to_dicts(), expire=TTL)
+    CORDIS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    df.write_parquet(CORDIS_CACHE, compression="zstd")
 
     return df
 
 
-def match_grants(companies: pl.DataFrame, cordis: pl.DataFrame) -> pl.DataFrame:
+def match_grants(companies: pl.LazyFrame, cordis: pl.DataFrame) -> pl.LazyFrame:
     """Match companies to CORDIS grants by name."""
     if cordis.is_empty():
         return companies.with_columns(
@@ -61,23 +67,9 @@ def match_grants(companies: pl.DataFrame, cordis: pl.DataFrame) -> pl.DataFrame:
             pl.lit(None).cast(pl.Utf8).alias("eu_project_title"),
         )
 
-    # Normalize company names for matching
-    companies = companies.with_columns(
-        pl.col("company_name")
-        .str.to_uppercase()
-        .str.replace_all(r"\s+(LIMITED|LTD|DAC|PLC|DESIGNATED ACTIVITY COMPANY)\.?$", "")
-        .str.strip_chars()
-        .alias("_name_norm")
-    )
-
-    # Normalize CORDIS names
-    cordis = cordis.with_columns(
-        pl.col("name")
-        .str.to_uppercase()
-        .str.replace_all(r"\s+(LIMITED|LTD|DAC|PLC)\.?$", "")
-        .str.strip_chars()
-        .alias("_name_norm")
-    )
+    # Normalize both sides with the same single-pass expression
+    companies = companies.with_columns(_norm_name("company_name"))
+    cordis = cordis.lazy().with_columns(_norm_name("name"))
 
     # Cast ecContribution to float (it can be string or number)
     cordis = cordis.with_columns(
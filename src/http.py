@@ -1,15 +1,29 @@
+from collections import OrderedDict
 from urllib.parse import urlparse
 from pathlib import Path
 from contextlib import asynccontextmanager
 
 import aiohttp
+import httpx
 from aiolimiter import AsyncLimiter
-from diskcache import Cache
+from diskcache import Cache, JSONDisk
 
 DATA_DIR = Path(__file__).parent.parent / "data"
-cache = Cache(DATA_DIR / ".cache")
+# JSONDisk with zlib level 6: HTML bodies compress 3-5x on disk
+cache = Cache(DATA_DIR / ".cache", disk=JSONDisk, disk_compress_level=6)
 TTL = 86400  # 1 day
 
+# In-memory LRU in front of diskcache; hot URLs skip SQLite entirely
+_MEM_MAX = 4096
+_mem: OrderedDict[str, str] = OrderedDict()
+
+
+def _mem_put(url: str, text: str):
+    _mem[url] = text
+    _mem.move_to_end(url)
+    if len(_mem) > _MEM_MAX:
+        _mem.popitem(last=False)
+
 RATE_LIMITS = {
     "core.cro.ie": AsyncLimiter(1, 1),
     "default": AsyncLimiter(1, 2),
@@ -19,6 +33,20 @@ RATE_LIMITS = {
 }
 
 _session: aiohttp.ClientSession | None = None
+_llm_http: httpx.AsyncClient | None = None
+
+
+def llm_http_client() -> httpx.AsyncClient:
+    """Shared bounded transport for the LLM clients: HTTP/2 multiplexing
+    and keepalive so concurrent requests reuse warm connections."""
+    global _llm_http
+    if _llm_http is None or _llm_http.is_closed:
+        _llm_http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        )
+    return _llm_http
 
 
 def _get_limiter(url: str) -> AsyncLimiter:
@@ -37,15 +65,24 @@ async def get_session() -> aiohttp.ClientSession:
 
 
 async def close_session():
-    global _session
+    global _session, _llm_http
     if _session and not _session.closed:
         await _session.close()
         _session = None
+    if _llm_http and not _llm_http.is_closed:
+        await _llm_http.aclose()
+        _llm_http = None
 
 
 async def fetch(url: str, skip_cache: bool = False) -> str | None:
-    if not skip_cache and url in cache:
-        return cache[url]
+    if not skip_cache:
+        if url in _mem:
+            _mem.move_to_end(url)
+            return _mem[url]
+        cached = cache.get(url)
+        if cached is not None:
+            _mem_put(url, cached)
+            return cached
 
     limiter = _get_limiter(url)
     session = await get_session()
@@ -57,6 +94,7 @@ async def fetch(url: str, skip_cache: bool = False) -> str | None:
                     return None
                 text = await resp.text()
                 cache.set(url, text, expire=TTL)
+                _mem_put(url, text)
                 return text
         except Exception:
             return None
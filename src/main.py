@@ -1,65 +1,106 @@
 import asyncio
+import json
 from datetime import date, timedelta
 from pathlib import Path
 
 import polars as pl
 
 from src.cro import download_companies
-from src.nace import get_nace_category, is_tech_company
+from src.nace import NACE_CATEGORIES, TECH_NACE_PREFIXES
 from src.enrich import download_cordis, match_grants
 from src.research import enrich_with_research
 from src.http import close_session
 
 OUTPUT_DIR = Path(__file__).parent.parent / "output"
 
-
-def filter_companies(df: pl.DataFrame) -> pl.DataFrame:
+OUTPUT_COLS = (
+    "company_num",
+    "company_name",
+    "company_type",
+    "company_reg_date",
+    "year",
+    "company_address_1",
+    "company_address_2",
+    "company_address_3",
+    "company_address_4",
+    "eircode",
+    "nace_v2_code",
+    "nace_category",
+    "is_tech",
+    # Enrichment columns, present only after the respective steps ran
+    "has_eu_grant",
+    "eu_grant_amount",
+    "eu_project_title",
+    "research_report",
+    "website",
+    "industry",
+    "sub_industry",
+    "tech_stack",
+    "business_model",
+    "stage",
+    "key_people",
+    "funding_total",
+    "employee_count",
+    "founded_year",
+    "verdict",
+    "verdict_reason",
+)
+
+CATEGORICAL_COLS = ("company_type", "nace_category", "verdict", "stage", "industry", "business_model")
+
+
+def filter_companies(lf: pl.LazyFrame) -> pl.LazyFrame:
     cutoff = date.today() - timedelta(days=5 * 365)
     cutoff_str = cutoff.isoformat()
 
-    return df.filter(
-        (pl.col("company_status").str.strip_chars() == "Normal")
-        & (pl.col("company_reg_date") >= cutoff_str)
-        & (
-            pl.col("company_type").str.contains("LTD")
-            | pl.col("company_type").str.contains("DAC")
-        )
+    # Cheap date comparison first, single LTD|DAC regex instead of two scans
+    return lf.filter(
+        (pl.col("company_reg_date") >= cutoff_str)
+        & (pl.col("company_status").str.strip_chars() == "Normal")
+        & pl.col("company_type").str.contains("LTD|DAC")
     )
 
 
-def add_nace_columns(df: pl.DataFrame) -> pl.DataFrame:
-    return df.with_columns(
-        pl.col("nace_v2_code").map_elements(get_nace_category, return_dtype=pl.Utf8).alias("nace_category"),
-        pl.col("nace_v2_code").map_elements(is_tech_company, return_dtype=pl.Boolean).alias("is_tech"),
+def add_nace_columns(lf: pl.LazyFrame) -> pl.LazyFrame:
+    # Vectorized prefix lookup instead of a Python call per row
+    prefix = pl.col("nace_v2_code").cast(pl.Int64, strict=False).cast(pl.Utf8).str.slice(0, 2)
+    return lf.with_columns(
+        pl.when(prefix.is_null())
+        .then(pl.lit("Unknown"))
+        .otherwise(prefix.replace_strict(NACE_CATEGORIES, default="Other"))
+        .alias("nace_category"),
+        prefix.is_in(TECH_NACE_PREFIXES).fill_null(False).alias("is_tech"),
+        pl.col("company_reg_date").str.slice(0, 4).cast(pl.Int16).alias("year"),
     )
 
 
 def select_output_columns(df: pl.DataFrame) -> pl.DataFrame:
     """Select and rename columns for final output."""
-    cols = [
-        "company_num",
-        "company_name",
-        "company_type",
-        "company_reg_date",
-        "company_address_1",
-        "company_address_2",
-        "company_address_3",
-        "company_address_4",
-        "eircode",
-        "nace_v2_code",
-        "nace_category",
-        "is_tech",
-    ]
-
-    # Add enrichment columns if present
-    for col in ["has_eu_grant", "eu_grant_amount", "eu_project_title",
-                "research_report", "website", "industry", "sub_industry", "tech_stack",
-                "business_model", "stage", "key_people", "funding_total", "employee_count",
-                "founded_year", "verdict", "verdict_reason"]:
-        if col in df.columns:
-            cols.append(col)
-
-    return df.select([c for c in cols if c in df.columns])
+    have = set(df.columns)
+
+    # Precomputed lowercase name so the dashboard search never re-lowercases
+    # the column per keystroke
+    out = df.select([c for c in OUTPUT_COLS if c in have]).with_columns(
+        pl.col("company_name").str.to_lowercase().alias("company_name_lc")
+    )
+
+    # Integer verdict code so the dashboard switches on an Int8 instead of
+    # substring-matching the verdict text
+    if "verdict" in out.columns:
+        out = out.with_columns(
+            pl.when(pl.col("verdict").str.contains("Promising")).then(0)
+            .when(pl.col("verdict").str.contains("Maybe")).then(1)
+            .when(pl.col("verdict").str.contains("Pass")).then(2)
+            .otherwise(-1)
+            .cast(pl.Int8)
+            .alias("verdict_code")
+        )
+
+    # Low-cardinality strings as Categorical: integer-code filters/group_bys
+    # and dictionary-encoded parquet pages
+    return out.with_columns(
+        pl.col(c).cast(pl.Categorical) for c in CATEGORICAL_COLS if c in have
+    )
 
 
 async def main():
@@ -67,37 +108,26 @@ async def main():
     print("Ireland CRO Company Scraper")
     print("=" * 60)
 
-    # Step 1: Download companies
+    # Steps 1-4 build a single lazy query over the CSV; one collect at the end
     print("\n[1/5] Downloading companies...")
     companies = await download_companies()
     companies = companies.unique(subset=["company_num"], keep="first")
-    print(f"  Total companies: {companies.shape[0]:,}")
 
-    # Step 2: Filter
     print("\n[2/5] Filtering...")
     filtered = filter_companies(companies)
-    print(f"  After filters: {filtered.shape[0]:,}")
 
-    # Step 3: Add NACE categories
     print("\n[3/5] Adding NACE categories...")
     enriched = add_nace_columns(filtered)
-    tech_count = enriched.filter(pl.col("is_tech") == True).shape[0]
-    print(f"  Tech companies: {tech_count:,}")
 
-    # Step 4: CORDIS grants
     print("\n[4/5] Matching EU grants...")
     cordis = await download_cordis()
-    if not cordis.is_empty():
-        enriched = match_grants(enriched, cordis)
-        grant_count = enriched.filter(pl.col("has_eu_grant") == True).shape[0]
-        print(f"  Companies with EU grants: {grant_count:,}")
-    else:
-        enriched = enriched.with_columns(
-            pl.lit(False).alias("has_eu_grant"),
-            pl.lit(None).cast(pl.Float64).alias("eu_grant_amount"),
-            pl.lit(None).cast(pl.Utf8).alias("eu_project_title"),
-        )
+    if cordis.is_empty():
         print("  (CORDIS data not available)")
+    enriched = match_grants(enriched, cordis).collect()
+    print(f"  After filters: {enriched.shape[0]:,}")
+    print(f"  Tech companies: {enriched['is_tech'].sum():,}")
+    if not cordis.is_empty():
+        print(f"  Companies with EU grants: {enriched['has_eu_grant'].sum():,}")
 
     # Step 5: Research enrichment (Tongyi DeepResearch)
     print("\n[5/5] Enriching with Tongyi DeepResearch...")
@@ -105,8 +135,15 @@ async def main():
     research_count = enriched.filter(pl.col("research_report").is_not_null()).shape[0]
     print(f"  Companies with research data: {research_count:,}")
 
-    # Sort: tech first, then by registration date
-    enriched = enriched.sort(["is_tech", "company_reg_date"], descending=[True, True])
+    # Sort: verdict first (so the dashboard table needs no per-rerun sort),
+    # then nace_category so row groups are category-homogeneous and the
+    # dashboard's is_in filter can skip them via min/max stats, then tech
+    # and registration date
+    enriched = enriched.sort(
+        ["verdict", "nace_category", "is_tech", "company_reg_date"],
+        descending=[False, False, True, True],
+        nulls_last=True,
+    )
 
     # Select output columns
     output = select_output_columns(enriched)
@@ -114,7 +151,21 @@ async def main():
     # Save
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     out_path = OUTPUT_DIR / "companies.parquet"
-    output.write_parquet(out_path)
+    output.write_parquet(
+        out_path,
+        row_group_size=50_000,
+        statistics=True,
+        compression="zstd",
+        compression_level=6,
+    )
+    # Distinct widget options, precomputed so the dashboard never runs
+    # unique() on the frame
+    opts = {"categories": sorted(c for c in output["nace_category"].unique().to_list() if c)}
+    for key, col in [("verdicts", "verdict"), ("stages", "stage")]:
+        vals = output[col].unique().to_list() if col in output.columns else []
+        opts[key] = sorted(v for v in vals if v and v != "Unknown")
+    (OUTPUT_DIR / "filter_options.json").write_text(json.dumps(opts))
+
     print(f"\n{'=' * 60}")
     print(f"Saved {output.shape[0]:,} companies to {out_path}")
     print("=" * 60)
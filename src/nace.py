@@ -21,33 +21,3 @@ NACE_CATEGORIES = {
 }
 
 TECH_NACE_PREFIXES = ["62", "63", "58", "64", "66", "21", "72", "26", "61"]
-
-
-def _normalize_code(code: float | str | None) -> str | None:
-    if code is None:
-        return None
-    if isinstance(code, float):
-        code = str(int(code))
-    return str(code).strip()
-
-
-def get_nace_category(code: float | str | None) -> str:
-    code = _normalize_code(code)
-    if not code:
-        return "Unknown"
-
-    # Try exact 2-digit prefix match
-    prefix = code[:2]
-    if prefix in NACE_CATEGORIES:
-        return NACE_CATEGORIES[prefix]
-
-    return "Other"
-
-
-def is_tech_company(code: float | str | None) -> bool:
-    code = _normalize_code(code)
-    if not code:
-        return False
-
-    prefix = code[:2]
-    return prefix in TECH_NACE_PREFIXES
@@ -3,11 +3,14 @@
 import asyncio
 import json
 import os
-import re
 
+import openai
+import polars as pl
+from aiolimiter import AsyncLimiter
 from openai import AsyncOpenAI
+from rapidfuzz import fuzz, process
 
-from src.http import cache, TTL
+from src.http import cache, llm_http_client, TTL
 
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://openrouter.ai/api/v1")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
@@ -15,169 +18,221 @@ EXTRACT_MODEL = "deepseek/deepseek-chat-v3-0324"
 
 _client: AsyncOpenAI | None = None
 
+# Requests/sec cap on top of the concurrency cap: fast responses would
+# otherwise let 20 slots burst past the OpenRouter quota into 429s
+RATE_LIMIT = AsyncLimiter(10, 1)
+
 
 def _get_client() -> AsyncOpenAI:
     global _client
     if _client is None:
-        _client = AsyncOpenAI(base_url=OPENAI_BASE_URL, api_key=OPENAI_API_KEY)
+        _client = AsyncOpenAI(base_url=OPENAI_BASE_URL, api_key=OPENAI_API_KEY, http_client=llm_http_client())
     return _client
 
 
-def _build_prompt(episode: dict) -> str:
-    """Build extraction prompt from episode info."""
-    return f"""Extract guest information from this podcast episode.
+BATCH_SIZE = 10
+
 
-Podcast: {episode.get("podcast", "")}
-Title: {episode.get("title", "")}
-Description: {episode.get("description", "")}
+def _build_batch_prompt(batch: list[dict]) -> str:
+    """Build extraction prompt covering a batch of episodes."""
+    blocks = "\n\n".join(
+        f"Episode {i}:\nPodcast: {ep.get('podcast', '')}\nTitle: {ep.get('title', '')}\nDescription: {ep.get('description', '')}"
+        for i, ep in enumerate(batch, 1)
+    )
+    return f"""Extract guest information from these podcast episodes.
 
-If this episode features a guest founder/executive, extract their information.
-If no clear guest is identified (e.g., news roundup, host solo episode), return null values.
+{blocks}
+
+For each episode that features a guest founder/executive, extract their information.
+If no clear guest is identified (e.g., news roundup, host solo episode), use null values.
 
 Return JSON only, no other text:
 {{
-    "guest_name": "Full name of guest or null",
-    "company_name": "Their company or null",
-    "role": "Title (CEO, Founder, CTO, etc.) or null",
-    "is_founder": true/false/null
+    "results": [
+        {{
+            "index": 1,
+            "guest_name": "Full name of guest or null",
+            "company_name": "Their company or null",
+            "role": "Title (CEO, Founder, CTO, etc.) or null",
+            "is_founder": true/false/null
+        }},
+        ...
+    ]
 }}"""
 
 
-def _parse_response(text: str) -> dict | None:
-    """Parse JSON from response."""
-    # Try to find JSON in response
-    json_match = re.search(r"\{[^{}]*\}", text, re.DOTALL)
-    if not json_match:
-        return None
-    try:
-        data = json.loads(json_match.group())
-        if not data.get("guest_name") or not data.get("company_name"):
-            return None
-        return data
-    except json.JSONDecodeError:
-        return None
-
-
-async def extract_guest(episode: dict) -> dict | None:
-    """Extract guest info from episode using DeepSeek."""
-    cache_key = f"podcast_extract:{episode.get('podcast')}:{episode.get('title')}"
-
-    if cache_key in cache:
-        return cache[cache_key]
-
-    prompt = _build_prompt(episode)
-
-    try:
-        client = _get_client()
-        response = await client.chat.completions.create(
-            model=EXTRACT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
-        )
-        text = response.choices[0].message.content
-        guest = _parse_response(text)
-
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str) -> dict | None:
+    """Decode the first JSON object in text, ignoring surrounding prose.
+
+    raw_decode handles nested objects and trailing text, unlike a regex."""
+    idx = text.find("{")
+    while idx != -1:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, idx)
+            return data
+        except json.JSONDecodeError:
+            idx = text.find("{", idx + 1)
+    return None
+
+
+def _parse_batch(text: str, n: int) -> list[dict | None]:
+    """Parse batch response into one guest dict (or None) per episode."""
+    data = _extract_json(text)
+    if data is None:
+        return [None] * n
+
+    out: list[dict | None] = [None] * n
+    results = data.get("results", [])
+    if not isinstance(results, list):
+        return out
+    for item in results:
+        if not isinstance(item, dict):
+            continue
+        idx = item.get("index")
+        if isinstance(idx, int) and 1 <= idx <= n and item.get("guest_name") and item.get("company_name"):
+            out[idx - 1] = {k: item.get(k) for k in ("guest_name", "company_name", "role", "is_founder")}
+    return out
+
+
+async def extract_guests_batch(batch: list[dict]) -> list[dict | None]:
+    """Extract guests from a batch of episodes in a single LLM call.
+
+    429s retry with backoff; auth/connection errors propagate so the
+    gather cancels the remaining batches instead of failing one by one.
+    """
+    client = _get_client()
+    for attempt in range(3):
+        try:
+            response = await client.chat.completions.create(
+                model=EXTRACT_MODEL,
+                messages=[{"role": "user", "content": _build_batch_prompt(batch)}],
+                temperature=0,
+            )
+            break
+        except openai.RateLimitError:
+            await asyncio.sleep(2 ** attempt)
+    else:
+        print(f"    Extract rate-limited: {batch[0].get('title', '')[:50]} (+{len(batch) - 1} more)")
+        return [None] * len(batch)
+
+    parsed = _parse_batch(response.choices[0].message.content, len(batch))
+
+    results = []
+    for ep, guest in zip(batch, parsed):
         if guest:
-            result = {
-                **guest,
-                "podcast": episode.get("podcast"),
-                "episode_title": episode.get("title"),
-                "pub_date": episode.get("pub_date"),
-                "link": episode.get("link"),
-            }
-            cache.set(cache_key, result, expire=TTL)
-            return result
-        return None
-
-    except Exception as e:
-        print(f"    Extract failed: {episode.get('title')[:50]} - {e}")
-        return None
+            # Cache only the extracted fields: episode metadata is merged
+            # back at assembly time and pub_date (a datetime) isn't
+            # JSON-serializable
+            cache.set(f"podcast_extract:{ep.get('podcast')}:{ep.get('title')}", guest, expire=TTL)
+            results.append(_with_episode(guest, ep))
+        else:
+            results.append(None)
+    return results
+
+
+def _ep_key(ep: dict) -> tuple:
+    return ep.get("podcast"), ep.get("title")
+
+
+def _with_episode(guest: dict, ep: dict) -> dict:
+    return {
+        **guest,
+        "podcast": ep.get("podcast"),
+        "episode_title": ep.get("title"),
+        "pub_date": ep.get("pub_date"),
+        "link": ep.get("link"),
+    }
 
 
 async def extract_all_guests(episodes: list[dict], concurrency: int = 20) -> list[dict]:
     """Extract guests from all episodes concurrently."""
+    # Dedupe by (podcast, title) and resolve cache hits up front so
+    # republished episodes and cached ones never occupy a semaphore slot
+    unique: dict[tuple, dict] = {}
+    for ep in episodes:
+        unique.setdefault(_ep_key(ep), ep)
+
+    results: dict[tuple, dict | None] = {}
+    misses = []
+    for key, ep in unique.items():
+        cached = cache.get(f"podcast_extract:{key[0]}:{key[1]}")
+        if cached is not None:
+            results[key] = _with_episode(cached, ep)
+        else:
+            misses.append(ep)
+
+    # One prompt per batch of episodes: far fewer round-trips and shared
+    # prompt-prefix tokens
+    batches = [misses[i:i + BATCH_SIZE] for i in range(0, len(misses), BATCH_SIZE)]
     semaphore = asyncio.Semaphore(concurrency)
     completed = 0
 
-    async def limited_extract(ep: dict) -> dict | None:
+    async def limited_batch(batch: list[dict]) -> list[dict | None]:
         nonlocal completed
-        async with semaphore:
-            result = await extract_guest(ep)
-            completed += 1
-            if completed % 50 == 0 or completed == len(episodes):
-                print(f"    {completed}/{len(episodes)}")
-            return result
-
-    results = await asyncio.gather(*[limited_extract(ep) for ep in episodes])
-    return [r for r in results if r is not None]
-
+        async with semaphore, RATE_LIMIT:
+            out = await extract_guests_batch(batch)
+            completed += len(batch)
+            print(f"    {completed}/{len(misses)}")
+            return out
 
-async def cluster_guests(guests: list[dict]) -> list[dict]:
-    """Use DeepSeek to identify same person across different name variations."""
-    # Build list of unique guest/company pairs
-    unique_pairs = list({(g["guest_name"], g["company_name"]) for g in guests})
+    for batch, out in zip(batches, await asyncio.gather(*[limited_batch(b) for b in batches])):
+        results.update(zip(map(_ep_key, batch), out))
 
-    if len(unique_pairs) <= 1:
-        return guests
+    # Fan back out onto the original episode list
+    return [r for r in (results.get(_ep_key(ep)) for ep in episodes) if r is not None]
 
-    pairs_text = "\n".join(f"{i+1}. {name} @ {company}" for i, (name, company) in enumerate(unique_pairs))
 
-    prompt = f"""Here are podcast guests extracted from different episodes. Some may be the same person with slightly different name spellings or company name variations.
+def cluster_guests(df: pl.DataFrame) -> pl.DataFrame:
+    """Merge name/company variations of the same person.
 
-{pairs_text}
+    Fuzzy-matches unique (name, company) pairs with RapidFuzz and unions
+    matches >= 92 — deterministic and CPU-local, unlike the LLM prompt
+    this replaces, which shipped the whole guest list over the network.
+    """
+    unique_pairs = df.select(["guest_name", "company_name"]).unique().rows()
 
-Identify which entries refer to the SAME person. Return JSON mapping each index to a canonical form:
-{{
-    "clusters": {{
-        "1": {{"name": "Canonical Name", "company": "Canonical Company"}},
-        "2": {{"name": "Canonical Name", "company": "Canonical Company"}},
-        ...
-    }}
-}}
-
-Rules:
-- If entries are the same person, give them the same canonical name/company
-- Use the most complete/formal version of the name
-- Use the most recognizable company name
-- If unsure, keep them separate
-
-Return JSON only."""
-
-    try:
-        client = _get_client()
-        response = await client.chat.completions.create(
-            model=EXTRACT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
+    if len(unique_pairs) <= 1:
+        return df
+
+    keys = [f"{name} @ {company}".lower().strip() for name, company in unique_pairs]
+    scores = process.cdist(keys, keys, scorer=fuzz.token_set_ratio, workers=-1)
+
+    # Union-find over same-person matches
+    parent = list(range(len(keys)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(keys)):
+        for j in range(i + 1, len(keys)):
+            if scores[i][j] >= 92:
+                parent[find(i)] = find(j)
+
+    # Canonical form = longest guest name in the cluster
+    canonical: dict[int, tuple] = {}
+    for i, pair in enumerate(unique_pairs):
+        root = find(i)
+        if root not in canonical or len(pair[0]) > len(canonical[root][0]):
+            canonical[root] = pair
+
+    canon = [canonical[find(i)] for i in range(len(unique_pairs))]
+    mapping = pl.DataFrame({
+        "guest_name": [p[0] for p in unique_pairs],
+        "company_name": [p[1] for p in unique_pairs],
+        "_canon_name": [c[0] for c in canon],
+        "_canon_company": [c[1] for c in canon],
+    })
+    return (
+        df.join(mapping, on=["guest_name", "company_name"], how="left")
+        .with_columns(
+            pl.col("_canon_name").alias("guest_name"),
+            pl.col("_canon_company").alias("company_name"),
         )
-        text = response.choices[0].message.content
-
-        # Parse response
-        json_match = re.search(r"\{.*\}", text, re.DOTALL)
-        if not json_match:
-            return guests
-
-        data = json.loads(json_match.group())
-        clusters = data.get("clusters", {})
-
-        # Build mapping from original to canonical
-        mapping = {}
-        for i, (name, company) in enumerate(unique_pairs):
-            idx = str(i + 1)
-            if idx in clusters:
-                canonical = clusters[idx]
-                mapping[(name, company)] = (canonical.get("name", name), canonical.get("company", company))
-            else:
-                mapping[(name, company)] = (name, company)
-
-        # Apply mapping to all guests
-        for g in guests:
-            key = (g["guest_name"], g["company_name"])
-            if key in mapping:
-                g["guest_name"], g["company_name"] = mapping[key]
-
-        return guests
-
-    except Exception as e:
-        print(f"    Clustering failed: {e}")
-        return guests
+        .drop("_canon_name", "_canon_company")
+    )
@@ -1,9 +1,13 @@
 """RSS feed fetching for startup podcasts."""
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
+import aiohttp
 import feedparser
 
+from src.http import cache, get_session
+
 FEEDS = [
     ("The Pitch", "https://feeds.megaphone.fm/thepitch"),
     ("Twenty Minute VC", "https://feeds.megaphone.fm/WWO3519750118"),
@@ -23,10 +27,33 @@ def _parse_date(entry) -> datetime | None:
     return None
 
 
-def fetch_feed(name: str, url: str, cutoff: datetime) -> list[dict]:
+async def fetch_feed(name: str, url: str, cutoff: datetime) -> list[dict]:
     """Fetch episodes from a single RSS feed."""
     try:
-        feed = feedparser.parse(url)
+        # Conditional GET: unchanged feeds answer 304 with no body and we
+        # re-parse the cached XML locally
+        headers = {}
+        if etag := cache.get(f"rss_etag:{url}"):
+            headers["If-None-Match"] = etag
+        if modified := cache.get(f"rss_modified:{url}"):
+            headers["If-Modified-Since"] = modified
+
+        session = await get_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=15), headers=headers) as resp:
+            if resp.status == 304:
+                body = cache.get(f"rss_body:{url}")
+            else:
+                body = await resp.text()
+                if etag := resp.headers.get("ETag"):
+                    cache.set(f"rss_etag:{url}", etag)
+                if modified := resp.headers.get("Last-Modified"):
+                    cache.set(f"rss_modified:{url}", modified)
+                cache.set(f"rss_body:{url}", body)
+        if not body:
+            return []
+
+        # XML parsing is CPU-bound; keep it off the event loop
+        feed = await asyncio.to_thread(feedparser.parse, body)
         episodes = []
         for entry in feed.entries:
             pub_date = _parse_date(entry)
@@ -36,7 +63,7 @@ def fetch_feed(name: str, url: str, cutoff: datetime) -> list[dict]:
                 "podcast": name,
                 "title": entry.get("title", ""),
                 "description": entry.get("summary", ""),
-                "pub_date": pub_date.isoformat(),
+                "pub_date": pub_date,
                 "link": entry.get("link", ""),
             })
         return episodes
@@ -45,15 +72,13 @@ def fetch_feed(name: str, url: str, cutoff: datetime) -> list[dict]:
         return []
 
 
-def fetch_all_feeds(days: int = 365) -> list[dict]:
-    """Fetch episodes from all feeds within time window."""
+async def fetch_all_feeds(days: int = 365) -> list[dict]:
+    """Fetch episodes from all feeds concurrently within time window."""
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-    all_episodes = []
+    results = await asyncio.gather(*[fetch_feed(name, url, cutoff) for name, url in FEEDS])
 
-    for name, url in FEEDS:
-        print(f"  Fetching {name}...")
-        episodes = fetch_feed(name, url, cutoff)
+    all_episodes = []
+    for (name, _), episodes in zip(FEEDS, results):
+        print(f"  {name}: {len(episodes)} episodes")
         all_episodes.extend(episodes)
-        print(f"    {len(episodes)} episodes")
-
     return all_episodes
@@ -7,15 +7,23 @@ import re
 from datetime import date
 from pathlib import Path
 
+import orjson
+import polars as pl
 from openai import AsyncOpenAI
 
-from src.http import cache, TTL
+from src.http import cache, llm_http_client, TTL
 
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://openrouter.ai/api/v1")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 RESEARCH_MODEL = "alibaba/tongyi-deepresearch-30b-a3b"
 
 OUTPUT_DIR = Path(__file__).parent.parent.parent / "output" / "podcast" / "research"
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+_JSON_TAG_RE = re.compile(r"<json>\s*(\{.*?\})\s*</json>", re.DOTALL)
+_JSON_FENCE_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+# C-level 256-entry table beats a character-class re.sub for the allowlist
+_SAFE_NAME = str.maketrans({c: "_" for c in map(chr, range(256)) if not c.isalnum()})
 
 _client: AsyncOpenAI | None = None
 
@@ -23,7 +31,7 @@ _client: AsyncOpenAI | None = None
 def _get_client() -> AsyncOpenAI:
     global _client
     if _client is None:
-        _client = AsyncOpenAI(base_url=OPENAI_BASE_URL, api_key=OPENAI_API_KEY)
+        _client = AsyncOpenAI(base_url=OPENAI_BASE_URL, api_key=OPENAI_API_KEY, http_client=llm_http_client())
     return _client
 
 
@@ -96,9 +104,7 @@ def _clean_value(value) -> str | None:
 
 def _parse_response(text: str) -> dict:
     """Parse response into markdown report + structured data."""
-    json_match = re.search(r"<json>\s*(\{.*?\})\s*</json>", text, re.DOTALL)
-    if not json_match:
-        json_match = re.search(r"```json\s*(\{.*?\})\s*```", text, re.DOTALL)
+    json_match = _JSON_TAG_RE.search(text) or _JSON_FENCE_RE.search(text)
 
     if json_match:
         json_start = json_match.start()
@@ -152,10 +158,11 @@ async def research_guest(guest: dict) -> dict | None:
         result["company_name"] = company
         cache.set(cache_key, result, expire=TTL)
 
-        # Save research JSON
-        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        safe_name = re.sub(r"[^a-zA-Z0-9]", "_", company)[:50]
-        (OUTPUT_DIR / f"{safe_name}.json").write_text(json.dumps(result, indent=2))
+        # Save research JSON; the write goes to a thread so the loop keeps
+        # draining the other research tasks
+        safe_name = company.translate(_SAFE_NAME)[:50]
+        blob = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+        await asyncio.to_thread((OUTPUT_DIR / f"{safe_name}.json").write_bytes, blob)
 
         return result
 
@@ -164,20 +171,16 @@ async def research_guest(guest: dict) -> dict | None:
         return None
 
 
-async def research_high_signal(guests: list[dict], limit: int = 20) -> list[dict]:
+async def research_high_signal(guests: pl.DataFrame, limit: int = 20) -> list[dict]:
     """Research high-signal guests concurrently."""
-    # Dedupe by company, take first limit
-    seen = set()
-    unique = []
-    for g in guests:
-        company = g.get("company_name")
-        if company and company not in seen:
-            seen.add(company)
-            unique.append(g)
-            if len(unique) >= limit:
-                break
-
-    print(f"  Researching {len(unique)} companies with Tongyi DeepResearch...")
+    # Vectorized dedupe: frame is score-sorted, keep the top row per company
+    unique = (
+        guests.drop_nulls("company_name")
+        .unique(subset=["company_name"], keep="first", maintain_order=True)
+        .head(limit)
+    )
+
+    print(f"  Researching {unique.height} companies with Tongyi DeepResearch...")
 
     semaphore = asyncio.Semaphore(5)
     completed = 0
@@ -187,8 +190,8 @@ async def research_high_signal(guests: list[dict], limit: int = 20) -> list[dict
         async with semaphore:
             result = await research_guest(guest)
             completed += 1
-            print(f"    {completed}/{len(unique)}: {guest.get('company_name')}")
+            print(f"    {completed}/{unique.height}: {guest.get('company_name')}")
             return result
 
-    results = await asyncio.gather(*[limited_research(g) for g in unique])
+    results = await asyncio.gather(*[limited_research(g) for g in unique.iter_rows(named=True)])
     return [r for r in results if r is not None]
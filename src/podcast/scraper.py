@@ -9,6 +9,7 @@ from src.podcast.feeds import fetch_all_feeds
 from src.podcast.extract import extract_all_guests, cluster_guests
 from src.podcast.analysis import analyze_guests, get_high_signal
 from src.podcast.research import research_high_signal
+from src.http import close_session
 
 OUTPUT_DIR = Path(__file__).parent.parent.parent / "output" / "podcast"
 
@@ -20,7 +21,7 @@ async def main():
 
     # Step 1: Fetch RSS feeds
     print("\n[1/5] Fetching RSS feeds (last year)...")
-    episodes = fetch_all_feeds(days=365)
+    episodes = await fetch_all_feeds(days=365)
     print(f"  Total episodes: {len(episodes)}")
 
     if not episodes:
@@ -38,36 +39,35 @@ async def main():
 
     # Step 3: Cluster guests (identify same person across name variations)
     print("\n[3/5] Clustering guests...")
-    unique_before = len({(g["guest_name"], g["company_name"]) for g in guests})
-    guests = await cluster_guests(guests)
-    unique_after = len({(g["guest_name"], g["company_name"]) for g in guests})
+    episodes_df = pl.DataFrame(guests)
+    unique_before = episodes_df.select(["guest_name", "company_name"]).unique().height
+    episodes_df = cluster_guests(episodes_df)
+    unique_after = episodes_df.select(["guest_name", "company_name"]).unique().height
     print(f"  Unique guests: {unique_before} -> {unique_after}")
 
     # Save all episodes
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    episodes_df = pl.DataFrame(guests)
-    episodes_df.write_parquet(OUTPUT_DIR / "all_episodes.parquet")
+    episodes_df.write_parquet(OUTPUT_DIR / "all_episodes.parquet", compression="zstd", statistics=True)
 
     # Step 4: Analyze and score
     print("\n[4/5] Analyzing guest signals...")
     analysis = analyze_guests(episodes_df)
-    analysis.write_parquet(OUTPUT_DIR / "guest_analysis.parquet")
+    analysis.write_parquet(OUTPUT_DIR / "guest_analysis.parquet", compression="zstd", statistics=True)
 
     high_signal = get_high_signal(analysis)
-    high_signal.write_parquet(OUTPUT_DIR / "high_signal.parquet")
+    high_signal.write_parquet(OUTPUT_DIR / "high_signal.parquet", compression="zstd", statistics=True)
     print(f"  Total unique guests: {analysis.shape[0]}")
     print(f"  High-signal founders: {high_signal.shape[0]}")
 
     # Step 5: Deep research for high-signal guests
     if high_signal.shape[0] > 0:
         print("\n[5/5] Researching high-signal founders with Tongyi...")
-        high_signal_dicts = high_signal.to_dicts()
-        researched = await research_high_signal(high_signal_dicts, limit=20)
+        researched = await research_high_signal(high_signal, limit=20)
         print(f"  Companies researched: {len(researched)}")
 
         if researched:
             research_df = pl.DataFrame(researched)
-            research_df.write_parquet(OUTPUT_DIR / "researched.parquet")
+            research_df.write_parquet(OUTPUT_DIR / "researched.parquet", compression="zstd", statistics=True)
     else:
         print("\n[5/5] No high-signal founders to research.")
 
@@ -80,6 +80,8 @@ async def main():
     print("\nTop signal founders:")
     print(high_signal.select(["guest_name", "company_name", "appearances", "unique_podcasts", "signal_score"]).head(10))
 
+    await close_session()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -6,14 +6,22 @@ Uses DuckDuckGo for website discovery and OpenAI-compatible API for analysis.
 
 import os
 import asyncio
+import hashlib
 import re
-from urllib.parse import urlparse
-
-from bs4 import BeautifulSoup
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, quote_plus, urlparse
+
+import aiohttp
+import lxml.etree
+import lxml.html
+import orjson
+from aiolimiter import AsyncLimiter
+from rapidfuzz import fuzz
 from openai import AsyncOpenAI
 import polars as pl
 
-from src.http import fetch, cache, TTL
+from src.http import fetch, cache, get_session, llm_http_client, TTL
 
 # Config from environment
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
@@ -22,52 +30,285 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 _client: AsyncOpenAI | None = None
 
+# In-memory TTL LRU in front of diskcache (same pattern as src.http):
+# repeat lookups skip the SQLite txn, cold reads go through to_thread so
+# they never block the event loop
+_MEM_MAX = 10_000
+_memcache: OrderedDict[str, tuple[float, object]] = OrderedDict()
+_MISS = object()
+
+
+async def _cache_get(key: str, default=None):
+    if (hit := _memcache.get(key)) is not None and hit[0] > time.time():
+        _memcache.move_to_end(key)
+        return hit[1]
+    value = await asyncio.to_thread(cache.get, key, default)
+    if value is not default:
+        _mem_put(key, value)
+    return value
+
+
+def _cache_set(key: str, value):
+    _mem_put(key, value)
+    cache.set(key, value, expire=TTL)
+
+
+def _mem_put(key: str, value):
+    _memcache[key] = (time.time() + TTL, value)
+    _memcache.move_to_end(key)
+    if len(_memcache) > _MEM_MAX:
+        _memcache.popitem(last=False)
+
 
 def _get_client() -> AsyncOpenAI:
     global _client
     if _client is None:
-        _client = AsyncOpenAI(base_url=OPENAI_BASE_URL, api_key=OPENAI_API_KEY)
+        _client = AsyncOpenAI(base_url=OPENAI_BASE_URL, api_key=OPENAI_API_KEY, http_client=llm_http_client())
     return _client
 
 
+_ANSWER_RE = re.compile(r"### ANSWER (\d+) ###")
+
+
+class BatchedLLM:
+    """Coalesce concurrent prompts into one completion call.
+
+    Callers await submit(); a worker drains up to MAX_BATCH pending
+    prompts (lingering <= LINGER for more to arrive), sends them as
+    numbered ### TASK ### blocks in a single request and routes the
+    ### ANSWER ### sections back to each caller's future. A lone prompt
+    goes out as a plain single call.
+    """
+
+    MAX_BATCH = 8
+    LINGER = 0.25
+
+    def __init__(self, system: str, max_tokens: int):
+        self.system = system
+        self.max_tokens = max_tokens
+        self.queue: asyncio.Queue[tuple[str, asyncio.Future]] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, prompt: str) -> str:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        fut = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((prompt, fut))
+        return await fut
+
+    async def _run(self):
+        while True:
+            items = [await self.queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.LINGER
+            while len(items) < self.MAX_BATCH:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except TimeoutError:
+                    break
+            await self._complete(items)
+            if self.queue.empty():
+                return
+
+    async def _complete(self, items: list[tuple[str, asyncio.Future]]):
+        try:
+            if len(items) == 1:
+                answers = {0: await self._call(items[0][0], self.max_tokens)}
+            else:
+                blocks = "\n\n".join(f"### TASK {i} ###\n{prompt}" for i, (prompt, _) in enumerate(items))
+                combined = (
+                    "Answer each task below independently. Begin each answer with a line "
+                    "'### ANSWER <id> ###' using the task's id. Answer every task.\n\n" + blocks
+                )
+                parts = _ANSWER_RE.split(await self._call(combined, self.max_tokens * len(items)))
+                answers = {int(i): text.strip() for i, text in zip(parts[1::2], parts[2::2])}
+        except Exception as e:
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for i, (_, fut) in enumerate(items):
+            if fut.done():
+                continue
+            if i in answers:
+                fut.set_result(answers[i])
+            else:
+                fut.set_exception(ValueError(f"no answer for task {i}"))
+
+    async def _call(self, prompt: str, max_tokens: int) -> str:
+        # Static instructions go first as a system message so the provider's
+        # automatic prompt caching can reuse the prefix across calls
+        response = await _get_client().chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": self.system},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0,
+            max_tokens=max_tokens,
+        )
+        return response.choices[0].message.content
+
+
+SYSTEM_SELECT = """You select links from a company website that would be most informative for understanding:
+- What the company does (products/services)
+- Who their customers are
+- Their technology/approach
+- Company background
+
+Given a list of links as "- <path>: <link text>", return ONLY the paths of up to 10 of the most informative pages, one per line. No explanations. Example:
+/about
+/products
+/solutions"""
+
+SYSTEM_ANALYZE = """You analyze a company's website content and produce a detailed investor-facing profile.
+
+Respond in this exact JSON format:
+{
+    "description": "2-4 sentences describing what the company does, their main product/service, and value proposition",
+    "products": "List of main products or services offered (comma-separated)",
+    "technology": "Key technologies, platforms, or technical approach mentioned",
+    "customers": "Target customer segments, industries served, or notable customers mentioned",
+    "use_cases": "Main use cases or problems they solve",
+    "category": "Primary category: SaaS, Fintech, Biotech, Healthcare, E-commerce, Marketplace, Developer Tools, AI/ML, Cybersecurity, EdTech, PropTech, CleanTech, HRTech, MarTech, LegalTech, InsurTech, Other",
+    "target_market": "B2B, B2C, or B2B2C",
+    "company_stage": "Estimated stage based on website: Startup, Growth, Enterprise (or Unknown)",
+    "differentiators": "What makes them unique or different from competitors"
+}
+
+Field guidance:
+- description: lead with the core offering, then who it is for and why it wins. Avoid marketing fluff copied verbatim.
+- products: concrete named products or service lines, not feature bullets.
+- technology: languages, platforms, infrastructure, AI/ML usage, integrations, or regulatory/technical moats.
+- customers: named logos if present, otherwise segments ("mid-market retailers", "hospitals").
+- use_cases: the problems solved, phrased from the buyer's perspective.
+- category: pick the single closest label from the list; use Other only when nothing fits.
+- target_market: who pays - B2B2C means sold to businesses but used by consumers.
+- company_stage: infer from team size, customer logos, pricing maturity and careers pages.
+- differentiators: claimed or evident edge versus competitors; "Unknown" if the site gives none.
+
+Extract as much detail as possible from the content. Use "Unknown" only if information is truly not available."""
+
+_SELECT_LLM = BatchedLLM(SYSTEM_SELECT, max_tokens=200)
+_ANALYZE_LLM = BatchedLLM(SYSTEM_ANALYZE, max_tokens=1000)
+
+
+_SUFFIX_RE = re.compile(r"\s(?:LIMITED|LTD|DESIGNATED ACTIVITY COMPANY|DAC|PLC|INC)\b", re.ASCII)
+# Suffixes, stopwords and whitespace fused into one pattern; re.ASCII
+# skips the Unicode word-boundary tables (CRO names are plain ASCII)
+_FUSED_NORM = re.compile(
+    r"\b(?:LIMITED|LTD|DESIGNATED ACTIVITY COMPANY|DAC|PLC|INC"
+    r"|THE|GROUP|IRELAND|INTERNATIONAL|SOLUTIONS|TECHNOLOGIES|SERVICES)\b|\s+",
+    re.ASCII,
+)
+
+
 def _normalize_name(name: str) -> str:
     """Normalize company name for comparison."""
-    name = name.upper()
-    for suffix in [" LIMITED", " LTD", " DESIGNATED ACTIVITY COMPANY", " DAC", " PLC", " INC"]:
-        name = name.replace(suffix, "")
-    return name.strip()
+    return _SUFFIX_RE.sub("", name.upper()).strip()
 
 
-def _domain_matches_company(domain: str, company_name: str) -> bool:
-    """Check if domain looks like it belongs to the company."""
-    domain = domain.lower().replace("www.", "").split(".")[0]
-    clean_name = _normalize_name(company_name).lower()
+def _match_name(company_name: str) -> str:
+    """Lowercased, suffix- and stopword-stripped name for domain matching.
+
+    One fused regex pass, computed once per company rather than per
+    candidate domain."""
+    return _FUSED_NORM.sub("", company_name.upper()).lower()
 
-    # Remove common words
-    for word in ["the", "group", "ireland", "international", "solutions", "technologies", "services"]:
-        clean_name = clean_name.replace(word, "")
-    clean_name = "".join(clean_name.split())  # Remove spaces
 
-    # Check if domain contains significant part of company name or vice versa
-    if len(domain) >= 4 and len(clean_name) >= 4:
-        return domain in clean_name or clean_name[:6] in domain
-    return False
+def _domain_matches_company(domain: str, match_name: str) -> bool:
+    """Check if domain looks like it belongs to the company."""
+    domain = domain.lower().removeprefix("www.").split(".")[0]
+    if len(domain) < 4 or len(match_name) < 4:
+        return False
+    # partial_ratio handles acmegroup/acme-style containment both ways,
+    # unlike the old clean_name[:6] substring heuristic
+    return fuzz.partial_ratio(domain, match_name) >= 80
+
+
+# Aggregator/social domains that are never the company's own site.
+# Compiled to one alternation: a single C-level scan per candidate
+# instead of ~30 Python substring checks
+SKIP_DOMAINS = ("linkedin.com", "facebook.com", "twitter.com", "youtube.com",
+                "bloomberg.com", "crunchbase.com", "glassdoor.com", "indeed.com",
+                "wikipedia.org", "google.com", "yelp.com", "tripadvisor.com",
+                "gov.ie", "cro.ie", "companieshouse", "dnb.com", "zoominfo.com",
+                "apollo.io", "pitchbook.com", "rocketreach.co", "jeuxvideo.com",
+                "halowaypoint.com", "support.google.com", "reddit.com", "quora.com",
+                "amazon.com", "ebay.com", "alibaba.com", "trustpilot.com",
+                "zhihu.com", "baidu.com", "weibo.com")  # Chinese sites
+_SKIP_DOMAIN_RE = re.compile("|".join(map(re.escape, SKIP_DOMAINS)))
+
+SKIP_PATHS = ("/login", "/signup", "/cart", "/checkout", "/privacy", "/terms", "/cookie")
+_SKIP_PATH_RE = re.compile("|".join(map(re.escape, SKIP_PATHS)))
+
+# Companies with no findable website this run; repeat lookups
+# short-circuit without touching either cache layer
+_neg_websites: set[str] = set()
+
+# DDG allows roughly one query per 1.5s before throttling
+_DDG_LIMIT = AsyncLimiter(1, 1.5)
+
+
+async def _ddg_search(query: str) -> list[str]:
+    """Search DuckDuckGo's HTML endpoint; async and cached via fetch()."""
+    async with _DDG_LIMIT:
+        body = await fetch(f"https://html.duckduckgo.com/html/?q={quote_plus(query)}")
+    if not body:
+        return []
+
+    urls = []
+    for href in lxml.html.fromstring(body).xpath('//a[@class="result__a"]/@href'):
+        # Results are redirect links with the target in the uddg param
+        if href.startswith("//duckduckgo.com/l/") or "/l/?" in href:
+            target = parse_qs(urlparse(href).query).get("uddg")
+            if target:
+                urls.append(target[0])
+        elif href.startswith("http"):
+            urls.append(href)
+    return urls[:8]
 
 
 async def _try_domain(domain: str) -> str | None:
-    """Check if a domain resolves to a valid website."""
+    """Probe whether a domain serves a real website.
+
+    A ranged GET against the shared session: only the first bytes are
+    needed to tell a live site from a parked page, and candidate domains
+    are all distinct hosts so the global fetch limiter is unnecessary.
+    """
     url = f"https://{domain}/"
-    html = await fetch(url)
-    if html and len(html) > 500:  # Basic check for real content
-        return url
-    return None
+    key = f"domain_ok:{domain}"
+    if (hit := await _cache_get(key, _MISS)) is not _MISS:
+        return url if hit else None
+
+    session = await get_session()
+    try:
+        async with session.get(
+            url,
+            headers={"Range": "bytes=0-4095"},
+            timeout=aiohttp.ClientTimeout(total=5, connect=2),
+        ) as resp:
+            body = await resp.content.read(4096)
+            ok = resp.status < 400 and len(body) > 500  # Basic check for real content
+    except Exception:
+        ok = False
+
+    _cache_set(key, ok)
+    return url if ok else None
 
 
 async def search_website(company_name: str) -> str | None:
     """Find company website via domain guessing and DuckDuckGo search."""
+    if company_name in _neg_websites:
+        return None
     cache_key = f"website:{company_name}"
-    if cache_key in cache:
-        return cache[cache_key]
+    if (cached := await _cache_get(cache_key, _MISS)) is not _MISS:
+        if cached is None:
+            _neg_websites.add(company_name)
+        return cached
 
     clean_name = _normalize_name(company_name)
     # Create URL-friendly version of company name
@@ -88,89 +329,118 @@ async def search_website(company_name: str) -> str | None:
     if len(first_word) >= 4:
         domains_to_try.extend([f"{first_word}.com", f"{first_word}.ie"])
 
-    for domain in domains_to_try:
-        url = await _try_domain(domain)
+    # Probe every candidate concurrently, keep the first hit in
+    # preference order
+    for url in await asyncio.gather(*[_try_domain(d) for d in domains_to_try]):
         if url:
-            cache.set(cache_key, url, expire=TTL)
+            _cache_set(cache_key, url)
             return url
 
     # Fall back to DuckDuckGo search
-    from duckduckgo_search import DDGS
-    import warnings
-    warnings.filterwarnings("ignore")
-
-    # Skip these domains
-    skip_domains = ["linkedin.com", "facebook.com", "twitter.com", "youtube.com",
-                    "bloomberg.com", "crunchbase.com", "glassdoor.com", "indeed.com",
-                    "wikipedia.org", "google.com", "yelp.com", "tripadvisor.com",
-                    "gov.ie", "cro.ie", "companieshouse", "dnb.com", "zoominfo.com",
-                    "apollo.io", "pitchbook.com", "rocketreach.co", "jeuxvideo.com",
-                    "halowaypoint.com", "support.google.com", "reddit.com", "quora.com",
-                    "amazon.com", "ebay.com", "alibaba.com", "trustpilot.com",
-                    "zhihu.com", "baidu.com", "weibo.com"]  # Chinese sites
+    queries = [
+        f"{clean_name} official website",
+        f"{clean_name} company Ireland",
+    ]
+    match_name = _match_name(company_name)
+
+    for query in queries:
+        for url in await _ddg_search(query):
+            parsed = urlparse(url)
+            domain = parsed.netloc.lower()
+            if _SKIP_DOMAIN_RE.search(domain):
+                continue
+
+            # Convert support.company.com to company.com
+            if domain.startswith("support."):
+                domain = domain[8:]
+                url = f"{parsed.scheme}://{domain}/"
+
+            if _domain_matches_company(domain, match_name):
+                _cache_set(cache_key, url)
+                return url
+
+    # Nothing found
+    _neg_websites.add(company_name)
+    _cache_set(cache_key, None)
+    return None
 
-    try:
-        import time
-
-        # Try multiple search strategies
-        queries = [
-            f"{clean_name} official website",
-            f"{clean_name} company Ireland",
-        ]
-
-        for query in queries:
-            time.sleep(1.5)  # Rate limit
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=8))
-                if not results:
-                    continue
-
-                # First pass: look for matching domains
-                for r in results:
-                    url = r.get("href", "")
-                    parsed = urlparse(url)
-                    domain = parsed.netloc.lower()
-                    if any(skip in domain for skip in skip_domains):
-                        continue
-
-                    # Convert support.company.com to company.com
-                    if domain.startswith("support."):
-                        main_domain = domain[8:]  # Remove "support."
-                        url = f"{parsed.scheme}://{main_domain}/"
-                        domain = main_domain
-
-                    if _domain_matches_company(domain, company_name):
-                        cache.set(cache_key, url, expire=TTL)
-                        return url
-
-        # Nothing found
-        cache.set(cache_key, None, expire=TTL)
-        return None
 
-    except Exception:
-        return None
+_WS_RE = re.compile(r"\s+")
+_CODEBLOCK_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+# Chrome/boilerplate elements stripped before text extraction
+_STRIP_TAGS = frozenset({"script", "style", "nav", "footer", "header"})
+
+
+class _TextTarget:
+    """Streaming parser target: appends text to a buffer while inside
+    content elements, discarding stripped-tag bodies on the fly instead
+    of materializing a DOM for multi-MB pages."""
+
+    def __init__(self):
+        self.buf = []
+        self.skip = 0
+
+    def start(self, tag, attrib):
+        if tag in _STRIP_TAGS:
+            self.skip += 1
+
+    def end(self, tag):
+        if tag in _STRIP_TAGS:
+            self.skip -= 1
+
+    def data(self, d):
+        if not self.skip:
+            self.buf.append(d)
+
+    def close(self):
+        return " ".join(self.buf)
+
+
+class _LinkTarget:
+    """Streaming parser target capturing only <a href> elements."""
+
+    def __init__(self):
+        self.links: list[tuple[str, str]] = []
+        self._href = None
+        self._text = []
+
+    def start(self, tag, attrib):
+        if tag == "a" and "href" in attrib:
+            self._href = attrib["href"]
+            self._text = []
+
+    def end(self, tag):
+        if tag == "a" and self._href is not None:
+            self.links.append((self._href, "".join(self._text).strip()[:100]))
+            self._href = None
+
+    def data(self, d):
+        if self._href is not None:
+            self._text.append(d)
+
+    def close(self):
+        return self.links
 
 
 def _extract_text(html: str) -> str:
     """Extract clean text from HTML."""
-    soup = BeautifulSoup(html, "lxml")
-    for tag in soup(["script", "style", "nav", "footer", "header"]):
-        tag.decompose()
-    text = soup.get_text(separator=" ", strip=True)
-    return re.sub(r"\s+", " ", text)
+    parser = lxml.etree.HTMLParser(target=_TextTarget())
+    return _WS_RE.sub(" ", lxml.etree.HTML(html, parser)).strip()
 
 
-def _extract_links(html: str, base_url: str) -> list[dict]:
-    """Extract all internal links from HTML."""
-    soup = BeautifulSoup(html, "lxml")
+def _extract_links(html: str, base_url: str) -> tuple[list[str], list[str], list[str]]:
+    """Extract internal links from HTML as parallel (urls, texts, paths) lists."""
+    parser = lxml.etree.HTMLParser(target=_LinkTarget())
+    anchors = lxml.etree.HTML(html, parser)
     parsed_base = urlparse(base_url)
     base_domain = parsed_base.netloc
 
-    links = []
+    urls: list[str] = []
+    texts: list[str] = []
+    paths: list[str] = []
     seen = set()
-    for a in soup.find_all("a", href=True):
-        href = a.get("href", "")
-        text = a.get_text(strip=True)[:100]
+    for href, text in anchors:
 
         # Skip empty, anchors, external links
         if not href or href.startswith("#") or href.startswith("mailto:") or href.startswith("tel:"):
@@ -186,51 +456,43 @@ def _extract_links(html: str, base_url: str) -> list[dict]:
 
         # Skip duplicates and common non-content pages
         path = urlparse(href).path.lower()
-        if path in seen or any(x in path for x in ["/login", "/signup", "/cart", "/checkout", "/privacy", "/terms", "/cookie"]):
+        if path in seen or _SKIP_PATH_RE.search(path):
             continue
         seen.add(path)
 
-        links.append({"url": href, "text": text, "path": path})
-
-    return links[:50]  # Cap at 50 for LLM selection
+        urls.append(href)
+        texts.append(text)
+        paths.append(path)
+        if len(paths) == 50:  # Cap at 50 for LLM selection
+            break
 
+    return urls, texts, paths
 
-async def _select_links_with_llm(links: list[dict], company_name: str) -> list[str]:
-    """Use LLM to select most informative links to follow."""
-    if not links:
-        return []
 
-    links_text = "\n".join([f"- {l['path']}: {l['text']}" for l in links])
+PRIORITY_PATHS = ("/about", "/product", "/solution", "/service", "/platform",
+                  "/company", "/team", "/customer", "/case", "/feature")
 
-    prompt = f"""Given these links from {company_name}'s website, select up to 10 that would be most informative for understanding:
-- What the company does (products/services)
-- Who their customers are
-- Their technology/approach
-- Company background
 
-Links:
-{links_text}
+async def _select_links_with_llm(texts: list[str], paths: list[str], company_name: str) -> list[str]:
+    """Use LLM to select most informative links to follow."""
+    if not paths:
+        return []
 
-Return ONLY the paths of the most informative pages, one per line. No explanations. Example:
-/about
-/products
-/solutions"""
+    links_text = "\n".join(f"- {p}: {t}" for p, t in zip(paths, texts))
+    prompt = f"Links from {company_name}'s website:\n{links_text}"
 
     try:
-        client = _get_client()
-        response = await client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
-            max_tokens=200,
-        )
-        text = response.choices[0].message.content.strip()
+        text = (await _SELECT_LLM.submit(prompt)).strip()
         selected_paths = [p.strip() for p in text.split("\n") if p.strip().startswith("/")]
         return selected_paths[:10]
     except Exception:
         # Fallback: select common informative paths
-        priority = ["/about", "/product", "/solution", "/service", "/platform", "/company", "/team", "/customer", "/case", "/feature"]
-        return [l["path"] for l in links if any(p in l["path"].lower() for p in priority)][:10]
+        return [p for p in paths if any(x in p for x in PRIORITY_PATHS)][:10]
+
+
+# Per-host budget: 10 outer-concurrent companies x 10 pages each would
+# otherwise mean 100 in-flight requests against single small hosts
+_HOST_SEMA: dict[str, asyncio.Semaphore] = {}
 
 
 async def scrape_website(url: str, company_name: str = "") -> dict | None:
@@ -241,44 +503,107 @@ async def scrape_website(url: str, company_name: str = "") -> dict | None:
 
     parsed = urlparse(url)
     base_url = f"{parsed.scheme}://{parsed.netloc}"
-
-    # Extract homepage content
-    homepage_text = _extract_text(html)[:6000]
-
-    # Extract and select links to follow
-    links = _extract_links(html, url)
-    selected_paths = await _select_links_with_llm(links, company_name)
+    sema = _HOST_SEMA.setdefault(parsed.netloc, asyncio.Semaphore(4))
+
+    async def bounded_fetch(page_url: str) -> str | None:
+        async with sema:
+            return await fetch(page_url)
+
+    # Extract homepage content; parsing runs in a worker thread (lxml
+    # releases the GIL) so multi-MB pages don't stall HTTP callbacks
+    homepage_text = (await asyncio.to_thread(_extract_text, html))[:6000]
+
+    # Optimistic analysis on homepage-only content, concurrent with link
+    # selection and sub-page scraping; kept when sub-pages add little
+    # (common for small Irish companies), halving LLM latency
+    prelim = asyncio.create_task(
+        analyze_company({"url": url, "pages": {"homepage": homepage_text}}, company_name)
+    )
+
+    # Extract and select links to follow; while the LLM decides, warm the
+    # fetch cache with the likely picks so their HTML is already local
+    _, texts, paths = await asyncio.to_thread(_extract_links, html, url)
+    prefetch_paths = [p for p in paths if any(x in p for x in PRIORITY_PATHS)][:5]
+    selected_paths, _ = await asyncio.gather(
+        _select_links_with_llm(texts, paths, company_name),
+        asyncio.gather(*[bounded_fetch(f"{base_url}{p}") for p in prefetch_paths]),
+    )
 
     # Scrape selected pages in parallel
     pages = {"homepage": homepage_text}
 
     async def fetch_page(path: str) -> tuple[str, str]:
-        page_url = f"{base_url}{path}"
-        page_html = await fetch(page_url)
+        page_html = await bounded_fetch(f"{base_url}{path}")
         if page_html:
-            return (path, _extract_text(page_html)[:4000])
+            return (path, (await asyncio.to_thread(_extract_text, page_html))[:4000])
         return (path, "")
 
     if selected_paths:
-        results = await asyncio.gather(*[fetch_page(p) for p in selected_paths])
-        for path, text in results:
+        # TaskGroup: one failure cancels siblings instead of orphaning them
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(fetch_page(p)) for p in selected_paths]
+        for path, text in (t.result() for t in tasks):
             if text:
                 pages[path] = text
 
+    extra = sum(len(text) for path, text in pages.items() if path != "homepage")
+    if extra > 2000:
+        prelim.cancel()
+        analysis = None
+    else:
+        analysis = await prelim
+
     return {
         "url": url,
         "pages": pages,
+        "analysis": analysis,
     }
 
 
+_SENT_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _compress_pages(pages: dict[str, str]) -> dict[str, str]:
+    """Drop text repeated across pages before prompting.
+
+    Sentences whose 5-gram shingles all appeared on an earlier page
+    (cookie banners, nav/footer copy that survived tag stripping) are
+    cut, as are fragments with fewer than 4 alphabetic words - fewer
+    prefill tokens for the same signal.
+    """
+    seen: set[int] = set()
+    out = {}
+    for name, text in pages.items():
+        kept = []
+        for sent in _SENT_RE.split(text):
+            words = sent.lower().split()
+            if sum(w.isalpha() for w in words) < 4:
+                continue
+            shingles = {hash(tuple(words[i:i + 5])) for i in range(max(len(words) - 4, 1))}
+            if shingles <= seen:
+                continue
+            seen |= shingles
+            kept.append(sent)
+        if kept:
+            out[name] = " ".join(kept)
+    return out
+
+
+def _content_key(content: str) -> str:
+    """Cache key from a fingerprint of normalized page content.
+
+    Templated sites (Wix/Squarespace shells, SPV boilerplate) serve
+    near-identical text under different URLs; keying on content lets
+    them share one analysis instead of paying a completion each.
+    """
+    norm = re.sub(r"\s+", " ", content[:4000].lower())
+    return "llm_content:" + hashlib.sha1(norm.encode()).hexdigest()
+
+
 async def analyze_company(website_data: dict, company_name: str) -> dict:
     """Use LLM to analyze company website content."""
-    cache_key = f"llm2:{website_data['url']}"  # New cache key for new format
-    if cache_key in cache:
-        return cache[cache_key]
-
-    # Build content from all pages
-    pages = website_data.get("pages", {})
+    # Build content from all pages, minus cross-page boilerplate
+    pages = _compress_pages(website_data.get("pages", {}))
     content_parts = []
     for page_name, text in pages.items():
         if text:
@@ -289,42 +614,21 @@ async def analyze_company(website_data: dict, company_name: str) -> dict:
     if len(content) > 30000:
         content = content[:30000] + "...[truncated]"
 
-    prompt = f"""Analyze this company's website content for "{company_name}" and provide a detailed profile.
-
-{content}
-
-Respond in this exact JSON format:
-{{
-    "description": "2-4 sentences describing what the company does, their main product/service, and value proposition",
-    "products": "List of main products or services offered (comma-separated)",
-    "technology": "Key technologies, platforms, or technical approach mentioned",
-    "customers": "Target customer segments, industries served, or notable customers mentioned",
-    "use_cases": "Main use cases or problems they solve",
-    "category": "Primary category: SaaS, Fintech, Biotech, Healthcare, E-commerce, Marketplace, Developer Tools, AI/ML, Cybersecurity, EdTech, PropTech, CleanTech, HRTech, MarTech, LegalTech, InsurTech, Other",
-    "target_market": "B2B, B2C, or B2B2C",
-    "company_stage": "Estimated stage based on website: Startup, Growth, Enterprise (or Unknown)",
-    "differentiators": "What makes them unique or different from competitors"
-}}
+    # Keyed on content, not URL: reruns, templated duplicates and the
+    # homepage-only preliminary pass each resolve to their own entry
+    fp_key = _content_key(content)
+    if (cached := await _cache_get(fp_key)) is not None:
+        return cached
 
-Extract as much detail as possible from the content. Use "Unknown" only if information is truly not available."""
+    prompt = f'Company: "{company_name}"\n\nWebsite content:\n{content}'
 
     try:
-        client = _get_client()
-        response = await client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
-            max_tokens=1000,  # Increased for detailed output
-        )
-
-        text = response.choices[0].message.content.strip()
-        # Parse JSON from response
-        import json
+        text = (await _ANALYZE_LLM.submit(prompt)).strip()
         # Handle markdown code blocks
         if "```" in text:
-            text = re.search(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL).group(1)
-        result = json.loads(text)
-        cache.set(cache_key, result, expire=TTL)
+            text = _CODEBLOCK_RE.search(text).group(1)
+        result = orjson.loads(text)
+        _cache_set(fp_key, result)
         return result
 
     except Exception as e:
@@ -362,7 +666,10 @@ async def enrich_company(company_name: str) -> dict:
             "differentiators": None,
         }
 
-    analysis = await analyze_company(website_data, company_name)
+    # Homepage-only preliminary analysis if sub-pages added nothing new
+    analysis = website_data["analysis"]
+    if analysis is None:
+        analysis = await analyze_company(website_data, company_name)
 
     return {
         "website_url": url,
@@ -382,11 +689,10 @@ async def enrich_with_websites(df: pl.DataFrame, limit: int = 100) -> pl.DataFra
     """Enrich DataFrame with website data for top N companies."""
     # Filter for actual software/IT companies (not financial SPVs)
     software_categories = ["Software & IT", "Data & Hosting", "Software Publishing"]
+    # One alternation = one scan of the name column instead of three
     subset = df.filter(
         (pl.col("nace_category").is_in(software_categories))
-        & (~pl.col("company_name").str.contains("DESIGNATED ACTIVITY"))  # Skip DACs/SPVs
-        & (~pl.col("company_name").str.contains("ISSUER"))
-        & (~pl.col("company_name").str.contains("FUND"))
+        & ~pl.col("company_name").str.contains("DESIGNATED ACTIVITY|ISSUER|FUND")
     ).head(limit)
     company_names = subset["company_name"].to_list()
 